@@ -4,23 +4,137 @@ Provides: ToolRegistry, AgentManager, ConfigWatcher and helper functions.
 """
 from __future__ import annotations
 import os
+import re
+import sys
+import mmap
 import json
-import time
-import yaml
+import hashlib
 import threading
+import time
 import logging
-import copy
-import requests
-from typing import Dict, Any, Callable, Optional, List
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, Callable, Optional, List, Mapping, Set, Tuple
+
+# yaml, requests, watchdog and the optional research_search accelerator
+# (hyperscan) are slow to import and only needed once a YAML config, REST
+# call, file watcher or search is actually used, so they are imported there.
+if TYPE_CHECKING:
+    import requests
+    from watchdog.observers import Observer
+
+# Optional faster JSON parser; orjson reads bytes directly
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
 
-# Watchdog imports
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+# Optional fast non-cryptographic hash for spec change detection
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("agent-core")
 
+@lru_cache(maxsize=None)
+def _yaml_loader():
+    """
+    Prefer the libyaml-backed loader; fall back to the pure-Python one when
+    PyYAML was built without libyaml.
+    """
+    import yaml
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@lru_cache(maxsize=None)
+def _scan_backend() -> str:
+    """
+    research_search term scanner to use: 'hyperscan' (SIMD multi-literal
+    matcher) when installed, else 'str'.
+    """
+    try:
+        import hyperscan  # noqa: F401
+        return 'hyperscan'
+    except ImportError:
+        return 'str'
+
+# research_search abandons a Hyperscan pass once it has seen more than one hit
+# per this many bytes and scores the file with str.count instead
+_SCAN_BYTES_PER_HIT = 1024
+
+# (connect, read) timeout for REST tool calls: fail fast on unreachable hosts,
+# allow slow responses
+_REST_TIMEOUT = (3.05, 10)
+_REST_RETRIES = 2
+_REST_BACKOFF = 0.2
+# Connections kept per host; also the number of calls to one host in flight at once
+_REST_POOL_MAXSIZE = 100
+# Longest a REST call can legitimately take: every attempt hitting both
+# timeouts, plus the backoff sleeps between retries
+_REST_CALL_BUDGET = ((_REST_RETRIES + 1) * sum(_REST_TIMEOUT)
+                     + sum(_REST_BACKOFF * 2 ** i for i in range(_REST_RETRIES)) + 1.0)
+
+# Converted OpenAPI documents kept by content digest (oldest evicted first)
+_OPENAPI_CACHE_SIZE = 16
+
+# Turns an OpenAPI path into a tool name fragment in one pass:
+# '/users/{id}' -> 'users_id' (after stripping the outer slashes)
+_NAME_TRANS = str.maketrans({'/': '_', '{': '', '}': ''})
+
+# Any newline convention (\n, \r\n, \r), for flattening snippets read as bytes
+_NEWLINES = re.compile(r'\r\n?|\n')
+
+
+def parse_json(data) -> Any:
+    """Parse a JSON document from str or bytes, with orjson when installed. Raises ValueError if malformed."""
+    return _json_loads(data)
+
+
+def _content_digest(data: bytes) -> int:
+    """64-bit digest of `data`: xxh3 when xxhash is installed, else blake2b."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def _memoize_kwargs(func: Callable[..., Any], maxsize: int = 512) -> Callable[..., Any]:
+    """
+    LRU-cache a keyword-only callable on its arguments. Calls with unhashable
+    arguments go straight to `func`; results are shared between callers, so
+    they must not be mutated. The wrapper exposes `cache_clear`.
+    """
+    @lru_cache(maxsize=maxsize)
+    def cached(items: Tuple[Tuple[str, Any], ...]):
+        return func(**dict(items))
+
+    def call(**kwargs):
+        key = tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return func(**kwargs)
+        return cached(key)
+
+    call.cache_clear = cached.cache_clear
+    return call
+
+
+def _spec_digest(fields: Dict[str, Any]) -> int:
+    """Digest of a spec's fields in canonical (sorted-key) JSON form."""
+    if orjson is not None:
+        data = orjson.dumps(fields, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    else:
+        data = json.dumps(fields, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    return _content_digest(data)
+
+
 # Mock registration service (same as demo)
 class MockMcpToolRegistrationService:
     def __init__(self):
@@ -85,44 +199,161 @@ else:
     logger.info("Microsoft Agent Framework SDK not found (tried: %s); using mock service.", ", ".join(tried))
 
 
+@dataclass(frozen=True, slots=True)
+class ToolSpec:
+    """Normalized tool definition; immutable so it can be shared freely once built."""
+    name: str
+    description: str
+    type: str
+    raw: Dict[str, Any]
+    params: Any = None
+    endpoint: Optional[str] = None
+    method: Optional[str] = None
+    function: Optional[str] = None
+    digest: int = 0
+    # config file the tool was loaded from
+    source: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The tool as a plain dict with the keys of the original normalized
+        config entry. Internal fields (digest, source) are left out: the digest
+        exceeds JS integer precision and source is a server file path.
+        """
+        out: Dict[str, Any] = {'name': self.name, 'description': self.description, 'type': self.type, 'raw': self.raw}
+        if self.type == 'rest':
+            out.update({'endpoint': self.endpoint, 'method': self.method, 'params': self.params})
+        else:
+            out.update({'function': self.function, 'params': self.params})
+        return out
+
+
 class ToolRegistry:
     def __init__(self, config_paths: List[str]):
         self.config_paths = config_paths
-        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.tools: Dict[str, ToolSpec] = {}
+        # path -> ((st_mtime_ns, st_size), normalized specs) for unchanged files
+        self._parse_cache: Dict[str, Tuple[Tuple[int, int], List[ToolSpec]]] = {}
+        # content digest -> tool entries converted from an OpenAPI document
+        self._openapi_cache: Dict[int, List[Dict[str, Any]]] = {}
 
-    def load_all(self) -> Dict[str, Dict[str, Any]]:
-        loaded: Dict[str, Dict[str, Any]] = {}
+    def load_all(self) -> Dict[str, ToolSpec]:
         for path in self.config_paths:
-            if not os.path.exists(path):
-                logger.warning("Config path not found: %s", path)
-                continue
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    text = f.read()
+            self._refresh(path)
+        return self._merge()
+
+    def reload_one(self, path: str, provisional: bool = False) -> Optional[Dict[str, ToolSpec]]:
+        """
+        Re-read only `path` and rebuild `tools` from the cached results of the other configs.
+        A `provisional` reload may catch the file mid-save, so it leaves `tools` alone and
+        returns None when the file is missing, fails to parse or drops tools it defined.
+        """
+        if not self._refresh(path, provisional):
+            return None
+        return self._merge()
+
+    def get_snapshot(self) -> Mapping[str, ToolSpec]:
+        """Read-only view of the tools from the last load or reload, without touching the disk."""
+        return MappingProxyType(self.tools)
+
+    def _refresh(self, path: str, provisional: bool = False) -> bool:
+        """Update the parse cache entry of `path`; False if a provisional reload deferred it."""
+        cached = self._parse_cache.get(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            if provisional and cached is not None:
+                return False
+            logger.warning("Config path not found: %s", path)
+            self._parse_cache.pop(path, None)
+            return True
+        key = (st.st_mtime_ns, st.st_size)
+        if cached is not None and cached[0] == key:
+            return True
+        specs = self._parse_config(path, provisional)
+        if specs is None:
+            if provisional:
+                return False
+            # Keep serving the last good parse: a reload can catch a file that
+            # is mid-save (truncated, half-written), and dropping its tools
+            # would unregister them until the next successful reload
+            if cached is not None:
+                logger.warning("Keeping previously loaded tools from %s", path)
+            return True
+        if provisional and cached is not None:
+            # A valid prefix of a half-written file parses fine but is missing
+            # the tools further down; leave those to the final reload
+            dropped = {s.name for s in cached[1]} - {s.name for s in specs}
+            if dropped:
+                logger.info("Deferring reload of %s: tools %s missing", path, sorted(dropped))
+                return False
+        self._parse_cache[path] = (key, specs)
+        return True
+
+    def _merge(self) -> Dict[str, ToolSpec]:
+        # Later configs override earlier ones on name clashes, as before. The
+        # result replaces `tools` whole, so snapshots taken earlier stay consistent.
+        loaded: Dict[str, ToolSpec] = {}
+        for path in self.config_paths:
+            cached = self._parse_cache.get(path)
+            if cached is not None:
+                for norm in cached[1]:
+                    loaded[norm.name] = norm
+        self.tools = loaded
+        return loaded
+
+    def _parse_config(self, path: str, provisional: bool = False) -> Optional[List[ToolSpec]]:
+        """
+        Read one config file and return its normalized tool specs, or None on failure.
+        `provisional` parses may see a file mid-save: any invalid entry fails the
+        whole parse, and failures are logged as a warning without a traceback.
+        """
+        try:
+            # Both parsers take the raw bytes, so no decoded copy of the file is made
+            with open(path, "rb") as f:
+                data = f.read()
+            # A rewrite with identical content (touch, checkout, save without
+            # edits) of an OpenAPI document skips both parsing and conversion
+            digest = _content_digest(data)
+            entries = self._openapi_cache.get(digest)
+            if entries is None:
                 if path.endswith('.json'):
-                    parsed = json.loads(text)
+                    parsed = _json_loads(data)
                 else:
-                    parsed = yaml.safe_load(text)
+                    import yaml
+                    parsed = yaml.load(data, Loader=_yaml_loader())
                 # If OpenAPI/Swagger document, convert to tool entries
                 if isinstance(parsed, dict) and ("openapi" in parsed or "swagger" in parsed):
                     logger.info("Detected OpenAPI/Swagger document at %s; converting to tools", path)
                     entries = self._convert_openapi(parsed)
                     logger.info("Converted %d operations from OpenAPI at %s", len(entries), path)
+                    if len(self._openapi_cache) >= _OPENAPI_CACHE_SIZE:
+                        del self._openapi_cache[next(iter(self._openapi_cache))]
+                    self._openapi_cache[digest] = entries
                 else:
                     entries = parsed.get('tools') if isinstance(parsed, dict) and 'tools' in parsed else parsed
-                if not isinstance(entries, list):
+            if not isinstance(entries, list):
+                if provisional:
+                    logger.warning("Config at %s is not a list of tool entries yet; retrying after the change settles", path)
+                else:
                     logger.error("Config at %s must contain a list of tool entries", path)
-                    continue
-                for entry in entries:
-                    try:
-                        norm = self._validate_and_normalize(entry)
-                        loaded[norm['name']] = norm
-                    except ValueError as ex:
-                        logger.error("Invalid tool entry in %s: %s", path, ex)
-            except Exception as ex:
+                return None
+            specs: List[ToolSpec] = []
+            for entry in entries:
+                try:
+                    specs.append(self._validate_and_normalize(entry, source=path))
+                except ValueError as ex:
+                    if provisional:
+                        logger.warning("Invalid tool entry in %s (%s); retrying after the change settles", path, ex)
+                        return None
+                    logger.error("Invalid tool entry in %s: %s", path, ex)
+            return specs
+        except Exception as ex:
+            if provisional:
+                logger.warning("Could not parse config %s (%s); retrying after the change settles", path, ex)
+            else:
                 logger.exception("Failed to read/parse config %s: %s", path, ex)
-        self.tools = loaded
-        return loaded
+            return None
 
     def _convert_openapi(self, spec: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -154,14 +385,20 @@ class ToolRegistry:
                 if method.lower() not in ("get", "post", "put", "delete", "patch"):
                     continue
                 op = op or {}
-                name = op.get("operationId") or f"{method.lower()}_{path.strip('/').replace('/', '_').replace('{','').replace('}','') or 'root'}"
+                name = op.get("operationId") or f"{method.lower()}_{path.strip('/').translate(_NAME_TRANS) or 'root'}"
                 summary = op.get("summary") or op.get("description") or ""
                 params: Dict[str, Any] = {}
                 for p in op.get("parameters", []) or []:
                     pname = p.get("name")
                     if not pname:
                         continue
-                    params[pname] = p.get("schema") or p.get("example") or p.get("default") or None
+                    # stop at the first key present instead of probing all three
+                    val = p.get("schema")
+                    if val is None:
+                        val = p.get("example")
+                        if val is None:
+                            val = p.get("default")
+                    params[pname] = val
                 if op.get("requestBody"):
                     params["body"] = None
                 base = servers[0]
@@ -177,7 +414,7 @@ class ToolRegistry:
                 entries.append(entry)
         return entries
 
-    def _validate_and_normalize(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+    def _validate_and_normalize(self, raw: Dict[str, Any], source: str = '') -> ToolSpec:
         if not isinstance(raw, dict):
             raise ValueError('Tool entry must be an object')
         name = raw.get('name')
@@ -187,7 +424,7 @@ class ToolRegistry:
         ttype = raw.get('type', 'rest')
         if ttype not in ('rest', 'local'):
             raise ValueError("Invalid 'type', must be 'rest' or 'local'")
-        spec: Dict[str, Any] = {'name': name, 'description': description, 'type': ttype, 'raw': raw}
+        fields: Dict[str, Any] = {'name': name, 'description': description, 'type': ttype, 'raw': raw}
         if ttype == 'rest':
             endpoint = raw.get('endpoint')
             method = raw.get('method', 'GET').upper()
@@ -196,20 +433,150 @@ class ToolRegistry:
                 raise ValueError("REST tool requires 'endpoint' string")
             if method not in ('GET', 'POST', 'PUT', 'DELETE', 'PATCH'):
                 raise ValueError(f"Unsupported HTTP method: {method}")
-            spec.update({'endpoint': endpoint, 'method': method, 'params': params})
+            fields.update({'endpoint': endpoint, 'method': method, 'params': params})
         else:
             function_name = raw.get('function')
             if not function_name or not isinstance(function_name, str):
                 raise ValueError("Local tool requires 'function' string name")
-            spec.update({'function': function_name, 'params': raw.get('params', {})})
-        return spec
+            fields.update({'function': function_name, 'params': raw.get('params', {})})
+        # `source` is bookkeeping, not content, so it stays out of the digest
+        return ToolSpec(**fields, digest=_spec_digest(fields), source=source)
+
+
+def _score_text(path: str, terms: List[str]) -> Optional[Tuple[int, str]]:
+    """
+    Score a file for research_search without an accelerated scanner: str.count of
+    each term in the lowercased text (C-speed, non-overlapping). Returns
+    (score, snippet around the first hit), or None when no term occurs.
+    """
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        txt = f.read()
+    lower = txt.lower()
+    score = sum(lower.count(t) for t in terms)
+    if score <= 0:
+        return None
+    idx = min(lower.find(t) for t in terms if t in lower)
+    start = max(0, idx - 120)
+    end = min(len(txt), idx + 240)
+    return score, txt[start:end].replace('\n', ' ')
+
+
+def _build_term_scanner(term_weights: List[Tuple[bytes, int]]) -> Callable[[Any], Optional[Tuple[int, int]]]:
+    """
+    Build a Hyperscan scorer for research_search from (lowercased term, weight)
+    pairs. The returned callable takes a bytes-like buffer and returns (score,
+    offset of the first hit or -1), matching case-insensitively. Each term is
+    counted like str.count (its own overlapping occurrences are skipped) times
+    its weight. It returns None instead when the buffer is too hit-dense to
+    score this way; _score_text is faster there.
+    """
+    import hyperscan
+    lengths = [len(t) for t, _ in term_weights]
+    weights = [w for _, w in term_weights]
+    db = hyperscan.Database()
+    db.compile(
+        # hex-escape every byte so terms are matched as plain literals
+        expressions=[b''.join(b'\\x%02x' % c for c in t) for t, _ in term_weights],
+        ids=list(range(len(term_weights))),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(term_weights),
+    )
+
+    # scratch space is per-thread in Hyperscan
+    local = threading.local()
+
+    def score_hyperscan(buf) -> Optional[Tuple[int, int]]:
+        scratch = getattr(local, 'scratch', None)
+        if scratch is None:
+            scratch = local.scratch = hyperscan.Scratch(db)
+        # Each hit costs a Python callback, so give up once they outnumber
+        # what str.count over the decoded text would cost.
+        budget = len(buf) // _SCAN_BYTES_PER_HIT
+        # A term's hits arrive in start order, so skipping the ones that
+        # overlap its previous counted hit counts it as str.count does.
+        next_free = [0] * len(lengths)
+        score = hits = 0
+        first = -1
+
+        def on_match(tid, frm, to, flags, ctx):
+            nonlocal score, hits, first
+            hits += 1
+            if frm >= next_free[tid]:
+                next_free[tid] = frm + lengths[tid]
+                score += weights[tid]
+                if first < 0 or frm < first:
+                    first = frm
+            # a true return halts the scan
+            return hits > budget
+
+        try:
+            db.scan(buf, match_event_handler=on_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return None
+        return score, first
+
+    return score_hyperscan
+
+
+class _SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key runs the
+    call and every caller that arrives while it is in flight waits for and
+    shares its result (or exception) instead of making its own.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Any, Future] = {}
+
+    def do(self, key: Any, fn: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+        if not leader:
+            return fut.result(timeout=timeout)
+        try:
+            result = fn()
+        except BaseException as ex:
+            fut.set_exception(ex)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
 
 
 class AgentManager:
-    def __init__(self, registration_service=None):
+    def __init__(self, registration_service=None, handler_cache_size: int = 10000,
+                 handler_cache_ttl: float = 300.0):
         self.service = registration_service() if registration_service else McpService()
-        self.registered: Dict[str, Dict[str, Any]] = {}
+        self.registered: Dict[str, ToolSpec] = {}
+        # Guards `registered` so readers such as the web UI never see a reload
+        # half-applied; reentrant because update_tools calls (un)register.
+        self._registry_lock = threading.RLock()
+        # Names in `registered`, republished as a new tuple after each update so
+        # list_registered can hand it out without taking the lock.
+        self._registered_names: Tuple[str, ...] = ()
         self.local_functions: Dict[str, Callable[..., Any]] = {}
+        # tool name -> memoized function, for local tools configured with `memoize: true`;
+        # kept across handler rebuilds and dropped when the tool is unregistered
+        self._memoized: Dict[str, Callable[..., Any]] = {}
+        # name -> (handler, time cached); LRU-ordered, backed by `registered`
+        # which rebuilds the handler on a miss or once the entry is too old.
+        self._handler_cache: OrderedDict[str, Tuple[Callable[..., Any], float]] = OrderedDict()
+        self._handler_cache_lock = threading.Lock()
+        self.handler_cache_size = handler_cache_size
+        self.handler_cache_ttl = handler_cache_ttl
+        # One pooled session shared by all REST tools, so repeat calls reuse
+        # keep-alive connections instead of doing a new TCP/TLS handshake.
+        # Created on the first REST call.
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        # Identical GETs in flight at the same time share one request
+        self._inflight_gets = _SingleFlight()
+        self._closed = False
         self._register_builtin_locals()
 
     def _register_builtin_locals(self):
@@ -231,34 +598,54 @@ class AgentManager:
             if not isinstance(query, str) or not query.strip():
                 return {"results": []}
             base = docs_dir or os.path.join(os.path.dirname(__file__), 'papers')
-            results = []
             terms = [t.lower() for t in query.split() if t.strip()]
+            # Hyperscan folds case on raw bytes, which only covers ASCII; any other
+            # term needs str.lower() on the decoded text to match as it always has.
+            accelerated = _scan_backend() != 'str' and all(t.isascii() for t in terms)
+            if accelerated:
+                # Repeated query terms keep counting once per repetition
+                term_weights = [(t.encode('utf-8'), w) for t, w in Counter(terms).items()]
+                score_buffer = _build_term_scanner(term_weights)
+
+            def scan_file(path: str) -> Optional[Dict[str, Any]]:
+                try:
+                    if accelerated:
+                        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            scanned = score_buffer(mm)
+                            if scanned is not None:
+                                score, idx = scanned
+                                if score <= 0:
+                                    return None
+                                # snippet around the first occurrence; only this window is decoded
+                                start = max(0, idx - 120)
+                                end = min(len(mm), idx + 240)
+                                snippet = _NEWLINES.sub(' ', mm[start:end].decode('utf-8', errors='ignore'))
+                                return {"file": os.path.relpath(path, base), "score": score, "snippet": snippet}
+                    scored = _score_text(path, terms)
+                except (OSError, ValueError):
+                    # unreadable, or empty (zero-length files cannot be mapped)
+                    return None
+                if scored is None:
+                    return None
+                return {"file": os.path.relpath(path, base), "score": scored[0], "snippet": scored[1]}
+
             try:
-                for root, _, files in os.walk(base):
-                    for fn in files:
-                        if not fn.lower().endswith(('.txt', '.md')):
-                            continue
-                        path = os.path.join(root, fn)
-                        try:
-                            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                                txt = f.read()
-                        except Exception:
-                            continue
-                        lower = txt.lower()
-                        score = 0
-                        for t in terms:
-                            score += lower.count(t)
-                        if score <= 0:
-                            continue
-                        # find first occurrence snippet
-                        idx = min((lower.find(t) for t in terms if t in lower), default=-1)
-                        if idx >= 0:
-                            start = max(0, idx - 120)
-                            end = min(len(txt), idx + 240)
-                            snippet = txt[start:end].replace('\n', ' ')
-                        else:
-                            snippet = txt[:240].replace('\n', ' ')
-                        results.append({"file": os.path.relpath(path, base), "score": score, "snippet": snippet})
+                paths = [
+                    os.path.join(root, fn)
+                    for root, _, files in os.walk(base)
+                    for fn in files
+                    if fn.lower().endswith(('.txt', '.md'))
+                ]
+                # Files score independently. Hyperscan scans without the GIL, so
+                # threads overlap it; str.count holds the GIL, so without it a
+                # pool would only add overhead.
+                workers = min(len(paths), os.cpu_count() or 1) if accelerated else 1
+                if workers > 1:
+                    with ThreadPoolExecutor(max_workers=workers) as ex:
+                        hits = list(ex.map(scan_file, paths))
+                else:
+                    hits = [scan_file(p) for p in paths]
+                results = [hit for hit in hits if hit is not None]
                 results.sort(key=lambda x: x['score'], reverse=True)
                 return {"results": results[:top_k]}
             except Exception as ex:
@@ -267,50 +654,54 @@ class AgentManager:
 
         self.local_functions['research_search'] = research_search
 
-    def update_tools(self, tools: Dict[str, Dict[str, Any]]):
-        desired = set(tools.keys())
-        current = set(self.registered.keys())
-        to_add = desired - current
-        to_remove = current - desired
-        to_check = desired & current
-        for name in to_remove:
-            try:
-                self._unregister_tool(name)
-            except Exception:
-                logger.exception('Error unregistering tool %s', name)
-        for name in to_add:
-            spec = tools[name]
-            try:
-                self._register_tool_from_spec(spec)
-            except Exception:
-                logger.exception('Error registering tool %s', name)
-        for name in to_check:
-            if tools[name] != self.registered.get(name):
-                logger.info("Tool '%s' changed, re-registering", name)
+    def update_tools(self, tools: Dict[str, ToolSpec]):
+        with self._registry_lock:
+            desired = set(tools.keys())
+            current = set(self.registered.keys())
+            to_add = desired - current
+            to_remove = current - desired
+            to_check = desired & current
+            for name in to_remove:
                 try:
                     self._unregister_tool(name)
                 except Exception:
-                    logger.exception('Error unregistering (for update) tool %s', name)
+                    logger.exception('Error unregistering tool %s', name)
+            for name in to_add:
+                spec = tools[name]
                 try:
-                    self._register_tool_from_spec(tools[name])
+                    self._register_tool_from_spec(spec)
                 except Exception:
-                    logger.exception('Error re-registering tool %s', name)
+                    logger.exception('Error registering tool %s', name)
+            for name in to_check:
+                # Digest compare instead of a deep walk of the nested spec
+                if tools[name].digest != self.registered[name].digest:
+                    logger.info("Tool '%s' changed, re-registering", name)
+                    try:
+                        self._unregister_tool(name)
+                    except Exception:
+                        logger.exception('Error unregistering (for update) tool %s', name)
+                    try:
+                        self._register_tool_from_spec(tools[name])
+                    except Exception:
+                        logger.exception('Error re-registering tool %s', name)
+            # a single reference swap, so readers see the old or new set, never a mix
+            self._registered_names = tuple(self.registered)
 
-    def _register_tool_from_spec(self, spec: Dict[str, Any]):
-        name = spec['name']
-        ttype = spec['type']
-        metadata = {'description': spec.get('description', ''), 'type': ttype}
-        if ttype == 'rest':
-            handler = self._make_rest_handler(spec)
-        else:
-            handler = self._make_local_handler(spec)
+    def _register_tool_from_spec(self, spec: ToolSpec):
+        name = spec.name
+        ttype = spec.type
+        metadata = {'description': spec.description, 'type': ttype}
+        handler = self._make_handler(spec)
         if hasattr(self.service, 'register_tool'):
             self.service.register_tool(name, metadata, handler)
         elif hasattr(self.service, 'register'):
             self.service.register(name, metadata, handler)
         else:
             raise AttributeError('Unsupported registration service API')
-        self.registered[name] = copy.deepcopy(spec)
+        # Specs are never mutated after normalization, so share the reference
+        with self._registry_lock:
+            self.registered[name] = spec
+            self._cache_handler(name, handler)
         logger.info("Registered tool '%s' (%s)", name, ttype)
 
     def _unregister_tool(self, name: str):
@@ -323,81 +714,336 @@ class AgentManager:
                 self.service.unregister_tool(name)
             else:
                 logger.warning('Registration service does not support unregister operation')
-        if name in self.registered:
-            del self.registered[name]
+        with self._registry_lock:
+            spec = self.registered.pop(name, None)
+            self._memoized.pop(name, None)
+            with self._handler_cache_lock:
+                self._handler_cache.pop(name, None)
         logger.info("Unregistered tool '%s'", name)
 
-    def _make_rest_handler(self, spec: Dict[str, Any]) -> Callable[..., Any]:
-        endpoint = spec['endpoint']
-        method = spec['method'].upper()
-        default_params = spec.get('params', {})
+    def get_handler(self, name: str) -> Optional[Callable[..., Any]]:
+        """Return the handler of registered tool `name`, or None if it is not registered."""
+        now = time.monotonic()
+        with self._handler_cache_lock:
+            entry = self._handler_cache.get(name)
+            if entry is not None and now - entry[1] < self.handler_cache_ttl:
+                self._handler_cache.move_to_end(name)
+                return entry[0]
+        with self._registry_lock:
+            spec = self.registered.get(name)
+            if spec is None:
+                return None
+            handler = self._make_handler(spec)
+            self._cache_handler(name, handler)
+        return handler
+
+    def _cache_handler(self, name: str, handler: Callable[..., Any]):
+        with self._handler_cache_lock:
+            self._handler_cache[name] = (handler, time.monotonic())
+            self._handler_cache.move_to_end(name)
+            while len(self._handler_cache) > self.handler_cache_size:
+                self._handler_cache.popitem(last=False)
+
+    def _make_handler(self, spec: ToolSpec) -> Callable[..., Any]:
+        if spec.type == 'rest':
+            return self._make_rest_handler(spec)
+        return self._make_local_handler(spec)
+
+    def _make_rest_handler(self, spec: ToolSpec) -> Callable[..., Any]:
+        name = spec.name
+        endpoint = spec.endpoint
+        method = spec.method
+        # Built once per registration; calls without overrides reuse it as-is
+        default_params = dict(spec.params) if isinstance(spec.params, dict) else {}
+        get_session = self._get_session
+        inflight_gets = self._inflight_gets
+
+        # GET sends params as the query string, other methods as a JSON body;
+        # chosen here so calls do not branch on the method
+        if method == 'GET':
+            def send(params: Dict[str, Any]):
+                def fetch():
+                    resp = get_session().get(endpoint, params=params, timeout=_REST_TIMEOUT)
+                    # read the body before the response is shared with waiting callers
+                    resp.content
+                    return resp
+                try:
+                    key = (endpoint, json.dumps(params, sort_keys=True, separators=(',', ':')))
+                except (TypeError, ValueError):
+                    # params that cannot be serialized cannot be compared; send on their own
+                    return fetch()
+                # GETs are idempotent, so identical concurrent calls can share one response
+                return inflight_gets.do(key, fetch, timeout=_REST_CALL_BUDGET)
+        else:
+            def send(params: Dict[str, Any]):
+                return get_session().request(method, endpoint, json=params, timeout=_REST_TIMEOUT)
 
         def handler(**kwargs):
-            params = {}
-            if isinstance(default_params, dict):
-                params.update(default_params)
-            if kwargs:
-                params.update(kwargs)
+            params = default_params | kwargs if kwargs else default_params
             try:
-                if method == 'GET':
-                    resp = requests.get(endpoint, params=params, timeout=10)
-                else:
-                    resp = requests.request(method, endpoint, json=params, timeout=10)
+                resp = send(params)
                 resp.raise_for_status()
                 try:
                     data = resp.json()
                 except ValueError:
                     data = resp.text
                 return {'status': 'ok', 'data': data, 'http_status': resp.status_code}
+            except FutureTimeout:
+                # waited on an identical call that is still in flight
+                logger.error("REST tool '%s' call timed out after %.0fs", name, _REST_CALL_BUDGET)
+                return {'status': 'error', 'error': f'timed out after {_REST_CALL_BUDGET:.0f}s'}
             except Exception as ex:
-                logger.exception("REST tool '%s' call failed: %s", spec['name'], ex)
-                return {'status': 'error', 'error': str(ex)}
+                logger.exception("REST tool '%s' call failed: %s", name, ex)
+                return {'status': 'error', 'error': str(ex) or type(ex).__name__}
 
         return handler
 
-    def _make_local_handler(self, spec: Dict[str, Any]) -> Callable[..., Any]:
-        func_name = spec.get('function')
+    def _get_session(self) -> requests.Session:
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._closed:
+                    raise RuntimeError('AgentManager is closed')
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+                    session = requests.Session()
+                    # pool_block caps sockets per host at pool_maxsize; excess
+                    # calls wait for a free connection instead of opening more
+                    adapter = HTTPAdapter(
+                        pool_connections=50,
+                        pool_maxsize=_REST_POOL_MAXSIZE,
+                        pool_block=True,
+                        max_retries=Retry(total=_REST_RETRIES, backoff_factor=_REST_BACKOFF,
+                                          status_forcelist=[502, 503, 504]),
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+                session = self._session
+        return session
+
+    def _make_local_handler(self, spec: ToolSpec) -> Callable[..., Any]:
+        name = spec.name
+        func_name = spec.function
         if func_name not in self.local_functions:
-            raise ValueError(f"Local function '{func_name}' not found for tool '{spec['name']}'")
+            raise ValueError(f"Local function '{func_name}' not found for tool '{name}'")
         func = self.local_functions[func_name]
+        if spec.raw.get('memoize'):
+            memoized = self._memoized.get(name)
+            if memoized is None:
+                memoized = self._memoized[name] = _memoize_kwargs(func)
+            func = memoized
 
         def handler(**kwargs):
             try:
                 result = func(**kwargs)
                 return {'status': 'ok', 'result': result}
             except Exception as ex:
-                logger.exception("Local tool '%s' failed: %s", spec['name'], ex)
+                logger.exception("Local tool '%s' failed: %s", name, ex)
                 return {'status': 'error', 'error': str(ex)}
 
         return handler
 
+    def clear_local_cache(self, name: Optional[str] = None):
+        """Drop memoized results of local tool `name`, or of every local tool when omitted."""
+        for tool, memoized in list(self._memoized.items()):
+            if name is None or tool == name:
+                memoized.cache_clear()
+
+    def close(self):
+        """Stop REST calls and release pooled HTTP connections; call on shutdown."""
+        with self._session_lock:
+            self._closed = True
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
     def list_registered(self) -> List[str]:
-        if hasattr(self.service, 'list_tools'):
+        # The mock holds exactly the tools registered here, so the lock-free
+        # snapshot answers for it; a real service may also know tools that were
+        # registered elsewhere, so it is asked directly.
+        if hasattr(self.service, 'list_tools') and not isinstance(self.service, MockMcpToolRegistrationService):
             return self.service.list_tools()
-        return list(self.registered.keys())
+        return list(self._registered_names)
 
 
-class ConfigChangeHandler(FileSystemEventHandler):
-    def __init__(self, registry: ToolRegistry, manager: AgentManager, paths: List[str]):
-        super().__init__()
+class ConfigChangeHandler:
+    """
+    Watches the config files of a single directory. ConfigWatcher schedules it
+    behind a watchdog pattern filter (_pattern_filter), so events for any other
+    file in that directory are dropped before they reach Python code here.
+    """
+    def __init__(self, registry: ToolRegistry, manager: AgentManager, paths: List[str],
+                 executor: Optional[ThreadPoolExecutor] = None, lockout: float = 0.3):
+        # file name -> path as configured in the registry
+        self.paths = {os.path.basename(p): p for p in paths}
         self.registry = registry
         self.manager = manager
-        self.paths = {os.path.abspath(p) for p in paths}
+        self.lockout = lockout
+        self._lock = threading.Lock()
+        # Reloads run here rather than on the observer or timer thread. A single
+        # worker shared by the handlers of all directories, so reloads never overlap.
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='config-reload')
+        # a reload is queued but has not yet taken the pending paths
+        self._scheduled = False
+        # the queued reload is the trailing one of a lockout window, so it applies
+        # whatever the files hold; the leading one is provisional
+        self._final = False
+        self._cancelled = False
+        self._timer: Optional[threading.Timer] = None
+        self._pending: Set[str] = set()
 
-    def on_modified(self, event):
+    def dispatch(self, event):
+        # Called by the watchdog observer for every event in the directory; this
+        # is the whole handler interface, so no watchdog base class is needed.
         if event.is_directory:
             return
-        abspath = os.path.abspath(event.src_path)
-        if abspath not in self.paths:
+        callback = getattr(self, f"on_{event.event_type}", None)
+        if callback is not None:
+            callback(event)
+
+    def on_modified(self, event):
+        self._schedule_reload(event.src_path)
+
+    def on_created(self, event):
+        self._schedule_reload(event.src_path)
+
+    def on_moved(self, event):
+        # Atomic-save editors write a temp file and rename it over the config
+        if os.path.basename(event.dest_path) in self.paths:
+            self._schedule_reload(event.dest_path)
+        else:
+            self._schedule_reload(event.src_path)
+
+    def _schedule_reload(self, src_path: str):
+        path = self.paths.get(os.path.basename(src_path))
+        if path is None:
+            return
+        logger.info("Detected modification of config: %s", src_path)
+        # Leading+trailing debounce: the first event reloads right away and
+        # opens a lockout window; events inside the window are only collected
+        # and reloaded once when it closes, so a burst costs at most two reloads.
+        with self._lock:
+            self._pending.add(path)
+            if self._timer is not None:
+                return
+            self._arm_lockout()
+            self._submit_reload(final=False)
+
+    def _arm_lockout(self):
+        # caller holds self._lock
+        self._timer = threading.Timer(self.lockout, self._lockout_expired)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _lockout_expired(self):
+        with self._lock:
+            # cancel() may have raced with this timer firing
+            if self._timer is not threading.current_thread():
+                return
+            if not self._pending:
+                self._timer = None
+                return
+            # More changes arrived during the window: reload and keep locking out
+            self._arm_lockout()
+            self._submit_reload(final=True)
+
+    def _submit_reload(self, final: bool):
+        # caller holds self._lock; changes made before a queued reload starts
+        # are picked up by it instead of queueing another
+        self._final = self._final or final
+        if not self._scheduled:
+            self._scheduled = True
+            self._executor.submit(self._reload)
+
+    def _reload(self):
+        with self._lock:
+            self._scheduled = False
+            changed, self._pending = self._pending, set()
+            final, self._final = self._final, False
+        if not changed:
             return
-        logger.info("Detected modification of config: %s", event.src_path)
-        time.sleep(0.1)
+        loaded = None
+        deferred: Set[str] = set()
         try:
-            loaded = self.registry.load_all()
-            self.manager.update_tools(loaded)
-            logger.info("Reloaded tools after change; registered: %s", self.manager.list_registered())
+            # Only the files that changed are re-read
+            for path in changed:
+                result = self.registry.reload_one(path, provisional=not final)
+                if result is None:
+                    deferred.add(path)
+                else:
+                    loaded = result
+            if loaded is not None:
+                self.manager.update_tools(loaded)
+                logger.info("Reloaded tools after change; registered: %s", self.manager.list_registered())
         except Exception:
             logger.exception("Error reloading tools after change")
+        if deferred:
+            # The file was caught mid-save; the trailing reload applies it
+            with self._lock:
+                if self._cancelled:
+                    return
+                self._pending |= deferred
+                if self._timer is None:
+                    self._arm_lockout()
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending.clear()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+
+@lru_cache(maxsize=None)
+def _pattern_filter():
+    """
+    watchdog handler class that matches events against a ConfigChangeHandler's
+    config file names and forwards only the matches to it. Built on first use
+    so watchdog is imported only when a watcher starts.
+    """
+    from watchdog.events import PatternMatchingEventHandler
+
+    class _PatternFilter(PatternMatchingEventHandler):
+        def __init__(self, target: ConfigChangeHandler):
+            super().__init__(patterns=list(target.paths), ignore_directories=True, case_sensitive=True)
+            self._target = target
+
+        def on_any_event(self, event):
+            self._target.dispatch(event)
+
+    return _PatternFilter
+
+
+def _native_observer() -> Observer:
+    """
+    Build a watchdog observer on the OS change-notification API (inotify,
+    FSEvents, ReadDirectoryChangesW). The generic Observer silently degrades
+    to polling when that backend fails to load, which costs idle CPU and adds
+    up to a poll interval of reload latency, so the fallback is logged.
+    """
+    cls = None
+    try:
+        if sys.platform.startswith('linux'):
+            from watchdog.observers.inotify import InotifyObserver as cls
+        elif sys.platform == 'darwin':
+            from watchdog.observers.fsevents import FSEventsObserver as cls
+        elif sys.platform == 'win32':
+            from watchdog.observers.read_directory_changes import WindowsApiObserver as cls
+    except Exception as ex:
+        logger.warning("Native file watcher unavailable (%s); using watchdog's default", ex)
+    if cls is None:
+        from watchdog.observers import Observer as cls
+    from watchdog.observers.polling import PollingObserver
+    if issubclass(cls, PollingObserver):
+        logger.warning("Config watcher is polling; changes are picked up with a delay")
+    return cls()
 
 
 class ConfigWatcher:
@@ -406,20 +1052,48 @@ class ConfigWatcher:
         self.manager = manager
         self.paths = paths
         self.observer: Optional[Observer] = None
+        self._handlers: List[ConfigChangeHandler] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
 
     def start(self):
-        event_handler = ConfigChangeHandler(self.registry, self.manager, self.paths)
-        obs = Observer()
-        dirs = {os.path.abspath(os.path.dirname(p)) for p in self.paths}
-        for d in dirs:
+        obs = _native_observer()
+        by_dir: Dict[str, List[str]] = {}
+        for p in self.paths:
+            by_dir.setdefault(os.path.abspath(os.path.dirname(p)), []).append(p)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='config-reload')
+        for d, dir_paths in by_dir.items():
             if not os.path.isdir(d):
                 continue
-            obs.schedule(event_handler, d, recursive=False)
+            event_handler = ConfigChangeHandler(self.registry, self.manager, dir_paths, executor=self._executor)
+            obs.schedule(_pattern_filter()(event_handler), d, recursive=False)
+            self._handlers.append(event_handler)
         obs.start()
         self.observer = obs
 
+    def reload(self, path: str):
+        """
+        Re-read config `path` and apply it now, for callers that just wrote it.
+        Runs on the worker of the watcher's own reloads, so the two never
+        overlap in the registry caches or reach update_tools out of order.
+        """
+        def apply():
+            self.manager.update_tools(self.registry.reload_one(path))
+
+        executor = self._executor
+        if executor is None:
+            apply()
+        else:
+            executor.submit(apply).result()
+
     def stop(self):
         if self.observer:
             self.observer.stop()
             self.observer.join()
             self.observer = None
+        for event_handler in self._handlers:
+            event_handler.cancel()
+        self._handlers = []
+        if self._executor is not None:
+            # lets a reload already running finish
+            self._executor.shutdown(wait=True)
+            self._executor = None
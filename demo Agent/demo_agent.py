@@ -40,15 +40,15 @@ import time
 import yaml
 import threading
 import logging
-import copy
 import requests
-from typing import Dict, Any, Callable, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Optional, List, Mapping, Tuple
 from flask import Flask, request, jsonify
 
 # Watchdog imports for file watching
 try:
     from watchdog.observers import Observer
-    from watchdog.events import FileSystemEventHandler
+    from watchdog.events import PatternMatchingEventHandler
 except Exception as e:
     print("Missing 'watchdog'. Install with: pip install watchdog")
     raise
@@ -64,10 +64,28 @@ except Exception:
     # Fallback mock below
     HAS_REAL_MCP = False
 
+# Optional faster JSON parser; orjson reads bytes directly
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# (connect, read) timeout for REST tool calls: fail fast on unreachable hosts,
+# allow slow responses
+_REST_TIMEOUT = (3.05, 10)
+
+# libyaml-backed loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("demo-agent")
 
+# Turns an OpenAPI path into a tool name fragment in one pass:
+# '/users/{id}' -> 'users_id' (after stripping the outer slashes)
+_NAME_TRANS = str.maketrans({'/': '_', '{': '', '}': ''})
+
 # -------------------------
 # Mock McpToolRegistrationService (fallback)
 # -------------------------
@@ -134,6 +152,8 @@ class ToolRegistry:
         self.config_paths = config_paths
         # Keep raw loaded mapping: name -> spec
         self.tools: Dict[str, Dict[str, Any]] = {}
+        # path -> ((st_mtime_ns, st_size), normalized entries); lets unchanged files skip parsing
+        self._parse_cache: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
 
     def load_all(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -142,16 +162,27 @@ class ToolRegistry:
         """
         loaded: Dict[str, Dict[str, Any]] = {}
         for path in self.config_paths:
-            if not os.path.exists(path):
+            try:
+                st = os.stat(path)
+            except OSError:
                 logger.warning("Config path not found: %s", path)
+                self._parse_cache.pop(path, None)
                 continue
+            key = (st.st_mtime_ns, st.st_size)
+            cached = self._parse_cache.get(path)
+            if cached is not None and cached[0] == key:
+                for norm in cached[1]:
+                    loaded[norm["name"]] = norm
+                continue
+            self._parse_cache.pop(path, None)
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    text = f.read()
+                # Both parsers take the raw bytes, so no decoded copy of the file is made
+                with open(path, "rb") as f:
+                    data = f.read()
                 if path.endswith(".json"):
-                    parsed = json.loads(text)
+                    parsed = _json_loads(data)
                 else:
-                    parsed = yaml.safe_load(text)
+                    parsed = yaml.load(data, Loader=_YAML_LOADER)
                 # If this looks like an OpenAPI/Swagger document, convert to tool entries
                 if isinstance(parsed, dict) and ("openapi" in parsed or "swagger" in parsed):
                     entries = self._convert_openapi(parsed)
@@ -162,12 +193,15 @@ class ToolRegistry:
                 if not isinstance(entries, list):
                     logger.error("Config at %s must contain a list of tool entries", path)
                     continue
+                normalized: List[Dict[str, Any]] = []
                 for entry in entries:
                     try:
                         norm = self._validate_and_normalize(entry)
                         loaded[norm["name"]] = norm
+                        normalized.append(norm)
                     except ValueError as ex:
                         logger.error("Invalid tool entry in %s: %s", path, ex)
+                self._parse_cache[path] = (key, normalized)
             except Exception as ex:
                 logger.exception("Failed to read/parse config %s: %s", path, ex)
         self.tools = loaded
@@ -241,7 +275,7 @@ class ToolRegistry:
                 if method.lower() not in ("get", "post", "put", "delete", "patch"):
                     continue
                 op: Dict[str, Any] = op or {}
-                name = op.get("operationId") or f"{method.lower()}_{path.strip('/').replace('/', '_').replace('{','').replace('}','') or 'root'}"
+                name = op.get("operationId") or f"{method.lower()}_{path.strip('/').translate(_NAME_TRANS) or 'root'}"
                 summary = op.get("summary") or op.get("description") or ""
                 # Build params dict defaults (query/path) with empty values
                 params: Dict[str, Any] = {}
@@ -282,9 +316,11 @@ class AgentManager:
         # If no service passed, instantiate McpService (real or mock)
         self.service = registration_service() if registration_service else McpService()
         # registered tools mapping: name -> spec
-        self.registered: Dict[str, Dict[str, Any]] = {}
+        self.registered: Dict[str, Mapping[str, Any]] = {}
         # local function map for 'local' tools
         self.local_functions: Dict[str, Callable[..., Any]] = {}
+        # set by update_tools whenever the registered tool set actually changes
+        self.changed = threading.Event()
         # Register built-in local functions
         self._register_builtin_locals()
 
@@ -320,6 +356,7 @@ class AgentManager:
         to_add = desired - current
         to_remove = current - desired
         to_check = desired & current  # may need update if spec changed
+        changed = bool(to_add or to_remove)
 
         # Remove obsolete tools
         for name in to_remove:
@@ -340,6 +377,7 @@ class AgentManager:
         for name in to_check:
             if tools[name] != self.registered.get(name):
                 logger.info("Tool '%s' changed, re-registering", name)
+                changed = True
                 try:
                     self._unregister_tool(name)
                 except Exception:
@@ -349,6 +387,9 @@ class AgentManager:
                 except Exception:
                     logger.exception("Error re-registering tool %s", name)
 
+        if changed:
+            self.changed.set()
+
     def _register_tool_from_spec(self, spec: Dict[str, Any]):
         name = spec["name"]
         ttype = spec["type"]
@@ -367,8 +408,8 @@ class AgentManager:
                 self.service.register(name, metadata, handler)
             else:
                 raise AttributeError("Unsupported registration service API")
-            # Track registered spec
-            self.registered[name] = copy.deepcopy(spec)
+            # Track registered spec as a read-only view; specs are never mutated after load
+            self.registered[name] = MappingProxyType(spec)
             logger.info("Registered tool '%s' (%s)", name, ttype)
         except Exception as ex:
             logger.exception("Failed to register tool '%s': %s", name, ex)
@@ -395,23 +436,26 @@ class AgentManager:
             raise
 
     def _make_rest_handler(self, spec: Dict[str, Any]) -> Callable[..., Any]:
+        name = spec["name"]
         endpoint = spec["endpoint"]
         method = spec["method"].upper()
-        default_params = spec.get("params", {})
+        # Built once per registration; calls without overrides reuse it as-is
+        params = spec.get("params")
+        default_params = dict(params) if isinstance(params, dict) else {}
+        # GET sends params as the query string, other methods as a JSON body;
+        # chosen here so calls do not branch on the method
+        if method == "GET":
+            def send(params: Dict[str, Any]):
+                return requests.get(endpoint, params=params, timeout=_REST_TIMEOUT)
+        else:
+            def send(params: Dict[str, Any]):
+                return requests.request(method, endpoint, json=params, timeout=_REST_TIMEOUT)
 
         def handler(**kwargs):
-            # Merge defaults and provided kwargs
-            params = {}
-            if isinstance(default_params, dict):
-                params.update(default_params)
-            if kwargs:
-                params.update(kwargs)
+            params = {**default_params, **kwargs} if kwargs else default_params
             try:
-                logger.debug("Invoking REST tool '%s' %s %s params=%s", spec["name"], method, endpoint, params)
-                if method == "GET":
-                    resp = requests.get(endpoint, params=params, timeout=10)
-                else:
-                    resp = requests.request(method, endpoint, json=params, timeout=10)
+                logger.debug("Invoking REST tool '%s' %s %s params=%s", name, method, endpoint, params)
+                resp = send(params)
                 resp.raise_for_status()
                 try:
                     data = resp.json()
@@ -419,7 +463,7 @@ class AgentManager:
                     data = resp.text
                 return {"status": "ok", "data": data, "http_status": resp.status_code}
             except Exception as ex:
-                logger.exception("REST tool '%s' call failed: %s", spec["name"], ex)
+                logger.exception("REST tool '%s' call failed: %s", name, ex)
                 return {"status": "error", "error": str(ex)}
         return handler
 
@@ -452,21 +496,21 @@ class AgentManager:
 # -------------------------
 # ConfigWatcher (watchdog-based)
 # -------------------------
-class ConfigChangeHandler(FileSystemEventHandler):
+class ConfigChangeHandler(PatternMatchingEventHandler):
+    """
+    Handles the config files of a single directory. watchdog matches each event
+    against the config file names before dispatching, so events for other files
+    and for directories never reach on_modified.
+    """
     def __init__(self, registry: ToolRegistry, manager: AgentManager, paths: List[str]):
-        super().__init__()
+        super().__init__(
+            patterns=sorted({"*" + os.sep + os.path.basename(p) for p in paths}),
+            ignore_directories=True,
+        )
         self.registry = registry
         self.manager = manager
-        # normalize absolute paths of interest
-        self.paths = {os.path.abspath(p) for p in paths}
 
     def on_modified(self, event):
-        # Filter for the files we care about
-        if event.is_directory:
-            return
-        abspath = os.path.abspath(event.src_path)
-        if abspath not in self.paths:
-            return
         logger.info("Detected modification of config: %s", event.src_path)
         # Debounce slight bursts by sleeping briefly
         time.sleep(0.1)
@@ -488,15 +532,16 @@ class ConfigWatcher:
         self.observer: Optional[Observer] = None
 
     def start(self):
-        event_handler = ConfigChangeHandler(self.registry, self.manager, self.paths)
         obs = Observer()
-        # Watch parent dirs for each path (avoid duplicate watchers)
-        dirs = {os.path.abspath(os.path.dirname(p)) for p in self.paths}
-        for d in dirs:
+        # Watch parent dirs for each path (one watch per directory)
+        by_dir: Dict[str, List[str]] = {}
+        for p in self.paths:
+            by_dir.setdefault(os.path.abspath(os.path.dirname(p)), []).append(p)
+        for d, dir_paths in by_dir.items():
             if not os.path.isdir(d):
                 continue
             logger.info("Starting watcher on directory: %s", d)
-            obs.schedule(event_handler, d, recursive=False)
+            obs.schedule(ConfigChangeHandler(self.registry, self.manager, dir_paths), d, recursive=False)
         obs.start()
         self.observer = obs
         logger.info("ConfigWatcher started.")
@@ -674,8 +719,8 @@ def demo_dynamic_addition(json_path: str, delay: int = 8):
     time.sleep(delay)
     try:
         logger.info("Demo: Adding DockerHub tool to %s", json_path)
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(json_path, "rb") as f:
+            data = _json_loads(f.read())
         tools = data.get("tools", [])
         # Avoid duplicate addition
         names = {t.get("name") for t in tools}
@@ -735,9 +780,12 @@ def main():
     # Interactive demonstration: show how to invoke tools via manager (mock)
     try:
         logger.info("Agent is running. Press Ctrl+C to exit.")
-        # Periodically print current registered tools
+        # Report and exercise the tools whenever a (re)load changes them; idle
+        # otherwise. The timed wait only keeps Ctrl+C responsive.
         while True:
-            time.sleep(6)
+            while not manager.changed.wait(timeout=30):
+                pass
+            manager.changed.clear()
             registered = manager.list_registered()
             logger.info("Currently registered tools: %s", registered)
             # If mock service, demonstrate invocation of a registered tool if available
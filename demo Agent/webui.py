@@ -7,8 +7,8 @@ import os
 import json
 import threading
 import logging
-from flask import Flask, jsonify, request, render_template, send_from_directory
-from agent_core import ToolRegistry, AgentManager, ConfigWatcher
+from flask import Flask, jsonify, request, render_template
+from agent_core import ToolRegistry, AgentManager, ConfigWatcher, parse_json
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger("webui")
@@ -19,7 +19,10 @@ JSON_PATH = os.path.join(CONFIG_DIR, "tools.json")
 YAML_PATH = os.path.join(CONFIG_DIR, "tools.yaml")
 OPENAPI_PATH = os.path.join(CONFIG_DIR, "openapi.yaml")
 
+# static_folder mounts /static/<filename> on Flask's own handler; browsers may
+# keep the files for a week instead of revalidating on every page load
 app = Flask(__name__, template_folder="templates", static_folder="static")
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 60 * 60 * 24 * 7
 
 # Initialize agent components
 registry = ToolRegistry([JSON_PATH, YAML_PATH, OPENAPI_PATH])
@@ -29,14 +32,17 @@ manager.update_tools(loaded)
 watcher = ConfigWatcher(registry, manager, [JSON_PATH, YAML_PATH, OPENAPI_PATH])
 watcher.start()
 
+# Serializes config saves so concurrent requests never share a temp file
+_save_lock = threading.Lock()
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
 @app.route('/api/tools', methods=['GET'])
 def api_tools():
-    tools = registry.load_all()
-    return jsonify({'tools': list(tools.values())})
+    # The watcher and config saves keep the registry current, so no disk reads here
+    return jsonify({'tools': [spec.to_dict() for spec in registry.get_snapshot().values()]})
 
 @app.route('/api/registered', methods=['GET'])
 def api_registered():
@@ -54,15 +60,10 @@ def api_invoke():
         if hasattr(manager.service, 'invoke'):
             result = manager.service.invoke(name, **params)
         else:
-            # fallback: call local registered handler
-            handler_spec = manager.registered.get(name)
-            if not handler_spec:
+            # fallback: call the handler built at registration
+            handler = manager.get_handler(name)
+            if handler is None:
                 return jsonify({'status': 'error', 'error': 'Tool not registered'}), 404
-            # Recreate handler and call
-            if handler_spec['type'] == 'local':
-                handler = manager._make_local_handler(handler_spec)
-            else:
-                handler = manager._make_rest_handler(handler_spec)
             result = handler(**params)
         return jsonify({'status': 'ok', 'result': result})
     except Exception as ex:
@@ -93,29 +94,58 @@ def api_save_config():
     content = body.get('content')
     if content is None:
         return jsonify({'status': 'error', 'error': 'Missing content'}), 400
+    if not isinstance(content, str):
+        return jsonify({'status': 'error', 'error': 'Content must be a string'}), 400
     if path == 'json':
         target = JSON_PATH
     elif path == 'yaml':
         target = YAML_PATH
     else:
         target = OPENAPI_PATH
+    if target == JSON_PATH:
+        # Reject malformed JSON up front rather than writing it and failing the reload
+        try:
+            parse_json(content)
+        except ValueError as ex:
+            return jsonify({'status': 'error', 'error': f'Invalid JSON: {ex}'}), 400
     try:
-        with open(target, 'w', encoding='utf-8') as f:
-            f.write(content)
-        # Trigger immediate reload
-        tools = registry.load_all()
-        manager.update_tools(tools)
+        with _save_lock:
+            try:
+                with open(target, 'r', encoding='utf-8') as f:
+                    unchanged = f.read() == content
+            except FileNotFoundError:
+                unchanged = False
+            if unchanged:
+                return jsonify({'status': 'ok'})
+            # Write beside the config and rename over it, so the watcher and
+            # readers never see a half-written file
+            tmp = target + '.tmp'
+            try:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                os.replace(tmp, target)
+            except Exception:
+                # don't leave a partial temp file beside the config
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+            # Reload just this file now, queued with the watcher's reloads; the
+            # watcher's own reload then finds it unchanged in the registry's
+            # (mtime, size) cache and skips it
+            watcher.reload(target)
         return jsonify({'status': 'ok'})
     except Exception as ex:
         logger.exception('Save config failed')
         return jsonify({'status': 'error', 'error': str(ex)}), 500
 
-@app.route('/static/<path:filename>')
-def static_files(filename):
-    return send_from_directory(os.path.join(BASE_DIR, 'static'), filename)
-
 def run_app(host='127.0.0.1', port=5000):
     app.run(host=host, port=port, debug=False)
 
 if __name__ == '__main__':
-    run_app()
+    try:
+        run_app()
+    finally:
+        watcher.stop()
+        manager.close()